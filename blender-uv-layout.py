@@ -1,4 +1,4 @@
-# ============================================================================ 
+# ============================================================================
 # blender-uv-layout.py
 # Generates UV map guides for a rectangular shape with real-world units.
 # Outputs:
@@ -11,16 +11,34 @@
 # License: MIT
 # Date: 2025-10-29
 # Updated:
-# ============================================================================ 
+# ============================================================================
 
-from PIL import Image, ImageDraw, ImageFont
-import json, math
+from PIL import Image, ImageDraw, ImageFont, features
+import numpy as np
+import argparse, json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; plain Python is fine at this scale
+    njit = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json works, just slower
+    orjson = None
+
+try:
+    import pyvips
+except ImportError:  # pyvips is optional; Pillow handles the PNG save
+    pyvips = None
 
 # ----------------------
 # Configuration
 # ----------------------
 
-# Real-world box dimensions (meters)
+# Default real-world box dimensions (meters)
 L = 12.2    # length
 W = 3.048   # width
 H = 3.1     # height
@@ -41,81 +59,162 @@ CUT_THICK_MM   = 8.0
 DASH_LEN_MM    = 25.0
 GAP_LEN_MM     = 15.0
 
-# Colors (RGBA)
-BG     = (0, 0, 0, 0)             # transparent
-FG     = (255, 255, 255, 255)     # main outline
-ACCENT = (180, 180, 180, 255)     # labels and dashed
+# Colors (palette indices)
+# The guide only ever uses three colors, so the canvas is a paletted
+# ("P" mode) image and all draw calls take palette indices. That keeps
+# the buffer at 1 byte/pixel and gives the PNG encoder 4x less data.
+BG     = 0      # transparent background
+FG     = 1      # main outline (white)
+ACCENT = 2      # labels and dashed (gray)
+PALETTE = [
+    0, 0, 0,          # BG (marked transparent at save time)
+    255, 255, 255,    # FG
+    180, 180, 180,    # ACCENT
+]
 
-# Output paths
+# RGBA LUT for the output paths that cannot stay paletted (WebP, pyvips):
+# indexing with the canvas array expands 1 byte/px to 4 in one gather.
+PALETTE_RGBA = np.array([
+    [0, 0, 0, 0],
+    [255, 255, 255, 255],
+    [180, 180, 180, 255],
+], dtype=np.uint8)
+
+# Default output paths
 PNG_PATH  = "uv-layout.png"
+WEBP_PATH = "uv-layout.webp"
 JSON_PATH = "uv_meta.json"
 
-# ----------------------
-# Faces and layout grid
-# ----------------------
-# Faces defined as (name, width_m, height_m).
-# Layout (rows x cols = 3 x 2):
-# Row 0: [SIDE A][END A]    -> END A butts to SIDE A right edge
-# Row 1: [TOP][BOTTOM]      -> both centered in their cells
-# Row 2: [SIDE B][END B]    -> END B butts to SIDE B right edge
-
-faces = [
-    ("SIDE A",   L, H),
-    ("END A",    W, H),
-    ("TOP",      L, W),
-    ("BOTTOM",   L, W),
-    ("SIDE B",   L, H),
-    ("END B",    W, H),
-]
-
-grid = [
-    [faces[0], faces[1]],
-    [faces[2], faces[3]],
-    [faces[4], faces[5]],
-]
-
 # ----------------------
 # Helpers
 # ----------------------
 
-def dashed_line(draw, p1, p2, dash_len, gap_len, fill, width):
-    (x1, y1), (x2, y2) = p1, p2
-    dx, dy = x2 - x1, y2 - y1
-    length = math.hypot(dx, dy)
-    if length <= 0:
+# One dash pattern per (dash, gap) pair, grown to the longest edge seen.
+# The pattern only depends on position along the edge, so every shorter
+# edge is just a prefix view of the same array -- one arange/modulo total.
+_DASH_CACHE = {}
+
+def dash_pattern(length, dash_len, gap_len):
+    # Boolean mask: True where a dash covers the pixel along the edge.
+    key = (dash_len, gap_len)
+    pat = _DASH_CACHE.get(key)
+    if pat is None or pat.shape[0] < length:
+        pat = _DASH_CACHE[key] = (np.arange(length) % (dash_len + gap_len)) < dash_len
+    return pat[:length]
+
+def dashed_rect(arr, rect, dash_len, gap_len, fill, width):
+    # Edges are axis-aligned, so the dashes are stamped straight into the
+    # index buffer with slice assignment.
+    x0, y0, x1, y1 = rect
+    w, h = x1 - x0, y1 - y0
+    if w <= 0 or h <= 0:
         return
-    ux, uy = dx / length, dy / length
-    dist = 0.0
-    while dist < length:
-        seg = min(dash_len, length - dist)
-        xs = x1 + ux * dist
-        ys = y1 + uy * dist
-        xe = x1 + ux * (dist + seg)
-        ye = y1 + uy * (dist + seg)
-        draw.line([(xs, ys), (xe, ye)], fill=fill, width=width)
-        dist += dash_len + gap_len
-
-def dashed_rect(draw, rect, dash_len, gap_len, fill, width):
+    hpat = dash_pattern(w, dash_len, gap_len)
+    vpat = dash_pattern(h, dash_len, gap_len)
+    edge = arr[y0:y1, x0:x1]
+    edge[:width, hpat] = fill        # top
+    edge[h - width:, hpat] = fill    # bottom
+    edge[vpat, :width] = fill        # left
+    edge[vpat, w - width:] = fill    # right
+
+def rect_outline(arr, rect, width, fill):
+    # Outline with the stroke growing inward, same as ImageDraw.rectangle
+    # with inclusive corners -- four slice fills on the index buffer.
     x0, y0, x1, y1 = rect
-    dashed_line(draw, (x0, y0), (x1, y0), dash_len, gap_len, fill, width)  # top
-    dashed_line(draw, (x1, y0), (x1, y1), dash_len, gap_len, fill, width)  # right
-    dashed_line(draw, (x1, y1), (x0, y1), dash_len, gap_len, fill, width)  # bottom
-    dashed_line(draw, (x0, y1), (x0, y0), dash_len, gap_len, fill, width)  # left
-
-def corner_ticks(draw, rect, tick_len, width, fill):
+    arr[y0:y0 + width, x0:x1 + 1] = fill              # top
+    arr[y1 - width + 1:y1 + 1, x0:x1 + 1] = fill      # bottom
+    arr[y0:y1 + 1, x0:x0 + width] = fill              # left
+    arr[y0:y1 + 1, x1 - width + 1:x1 + 1] = fill      # right
+
+def corner_ticks_np(arr, rect, tick_len, width, fill):
+    # Ticks are axis-aligned rectangles, written straight into the image
+    # buffer with slice assignment instead of 8 draw.line calls per face.
     x0, y0, x1, y1 = rect
-    # top-left
-    draw.line([(x0, y0), (x0 + tick_len, y0)], fill=fill, width=width)
-    draw.line([(x0, y0), (x0, y0 + tick_len)], fill=fill, width=width)
-    # top-right
-    draw.line([(x1, y0), (x1 - tick_len, y0)], fill=fill, width=width)
-    draw.line([(x1, y0), (x1, y0 + tick_len)], fill=fill, width=width)
-    # bottom-right
-    draw.line([(x1, y1), (x1 - tick_len, y1)], fill=fill, width=width)
-    draw.line([(x1, y1), (x1, y1 - tick_len)], fill=fill, width=width)
-    # bottom-left
-    draw.line([(x0, y1), (x0 + tick_len, y1)], fill=fill, width=width)
-    draw.line([(x0, y1), (x0, y1 - tick_len)], fill=fill, width=width)
+    # horizontal ticks (top-left, top-right, bottom-left, bottom-right)
+    arr[y0:y0 + width, x0:x0 + tick_len] = fill
+    arr[y0:y0 + width, x1 - tick_len:x1] = fill
+    arr[y1 - width:y1, x0:x0 + tick_len] = fill
+    arr[y1 - width:y1, x1 - tick_len:x1] = fill
+    # vertical ticks
+    arr[y0:y0 + tick_len, x0:x0 + width] = fill
+    arr[y0:y0 + tick_len, x1 - width:x1] = fill
+    arr[y1 - tick_len:y1, x0:x0 + width] = fill
+    arr[y1 - tick_len:y1, x1 - width:x1] = fill
+
+def face_stamp(cache, fw, fh, cut_w, safe_w, tick_len, tick_w,
+               safe_inset, dash_len, gap_len):
+    # One rendered face tile per unique (fw, fh) size: cut outline, dashed
+    # safe rect and corner ticks. The six faces of a box collapse to ~4
+    # unique sizes, so most faces are a single masked blit. The cache is
+    # per render call since the pixel constants depend on the scale.
+    key = (fw, fh)
+    stamp = cache.get(key)
+    if stamp is None:
+        stamp = np.zeros((fh + 1, fw + 1), dtype=np.uint8)
+        rect_outline(stamp, (0, 0, fw, fh), cut_w, FG)
+        dashed_rect(stamp, (safe_inset, safe_inset, fw - safe_inset, fh - safe_inset),
+                    dash_len, gap_len, ACCENT, safe_w)
+        corner_ticks_np(stamp, (0, 0, fw, fh), tick_len, tick_w, FG)
+        cache[key] = stamp
+    return stamp
+
+# Rendered label masks keyed by text. FreeType rasterizes each distinct
+# string once per process; repeated labels (fixed seam tag, batch runs
+# sharing dimensions) are just a masked store.
+_LABEL_CACHE = {}
+
+def text_cached(arr, xy, text, fill, font):
+    mask = _LABEL_CACHE.get(text)
+    if mask is None:
+        x0, y0, x1, y1 = font.getbbox(text)
+        # Slack past the reported bbox: without antialiasing each glyph
+        # advance can round up a pixel, so the render runs a little wide.
+        glyphs = Image.new("L", (x1 + len(text) + 4, y1 + 2), 0)
+        glyph_draw = ImageDraw.Draw(glyphs)
+        # fontmode "1" matches what draw.text did on the paletted canvas,
+        # so glyph coverage is all-or-nothing.
+        glyph_draw.fontmode = "1"
+        glyph_draw.text((0, 0), text, fill=255, font=font)
+        mask = _LABEL_CACHE[text] = np.array(glyphs) > 0
+    x, y = xy
+    region = arr[y:y + mask.shape[0], x:x + mask.shape[1]]
+    region[mask[:region.shape[0], :region.shape[1]]] = fill
+
+def compute_rects(fw, fh, butt, cols_px, rows_px, grid_x0, grid_y0,
+                  col_gap, row_gap, safe_inset):
+    # Per-face cut and safe rectangles as (N, 4) int32 arrays of
+    # (x0, y0, x1, y1). Faces are ordered row-major, two per row; a face
+    # with butt[i] set gets its left edge butted to its row neighbour's
+    # right edge instead of being centered in the right cell.
+    # Kept free of Python objects so numba can JIT it for large batches.
+    n = fw.shape[0]
+    cut = np.zeros((n, 4), dtype=np.int32)
+    y = grid_y0
+    for r in range(n // 2):
+        cell_h = rows_px[r]
+        for c in range(2):
+            i = 2 * r + c
+            if butt[i]:
+                x0 = cut[i - 1, 2]
+            elif c == 0:
+                x0 = grid_x0 + (cols_px[0] - fw[i]) // 2
+            else:
+                x0 = grid_x0 + cols_px[0] + col_gap + (cols_px[1] - fw[i]) // 2
+            y0 = y + (cell_h - fh[i]) // 2
+            cut[i, 0] = x0
+            cut[i, 1] = y0
+            cut[i, 2] = x0 + fw[i]
+            cut[i, 3] = y0 + fh[i]
+        y += cell_h + row_gap
+    safe = np.empty_like(cut)
+    safe[:, 0] = cut[:, 0] + safe_inset
+    safe[:, 1] = cut[:, 1] + safe_inset
+    safe[:, 2] = cut[:, 2] - safe_inset
+    safe[:, 3] = cut[:, 3] - safe_inset
+    return cut, safe
+
+if njit is not None:
+    compute_rects = njit(cache=True)(compute_rects)
 
 def rect_to_uv(rect, canvas_w, canvas_h):
     x0, y0, x1, y1 = rect
@@ -128,142 +227,225 @@ def rect_to_uv(rect, canvas_w, canvas_h):
     }
 
 # ----------------------
-# Compute layout scale
+# Render
 # ----------------------
 
-# Column and row maxima (meters)
-cols_m = [0.0, 0.0]
-rows_m = [0.0, 0.0, 0.0]
-for r in range(3):
-    for c in range(2):
-        _, wm, hm = grid[r][c]
-        cols_m[c] = max(cols_m[c], wm)
-        rows_m[r] = max(rows_m[r], hm)
-
-sum_cols_m = sum(cols_m)
-sum_rows_m = sum(rows_m)
-
-# Available pixel area for faces (excluding margins and gaps)
-avail_w_px = CANVAS_W - 2 * MARGIN_PX - (2 - 1) * COL_GAP_PX
-avail_h_px = CANVAS_H - 2 * MARGIN_PX - (3 - 1) * ROW_GAP_PX
-
-# Scale (pixels per meter), uniform to preserve proportions
-s_w = avail_w_px / sum_cols_m
-s_h = avail_h_px / sum_rows_m
-s = min(s_w, s_h)
-
-def mm_to_px(mm):
-    return max(1, int(round((mm / 1000.0) * s)))
-
-# Precompute pixel column/row sizes for grid cells
-cols_px = [int(round(wm * s)) for wm in cols_m]
-rows_px = [int(round(hm * s)) for hm in rows_m]
-
-# Grid origin in canvas
-grid_w_px = sum(cols_px) + COL_GAP_PX
-grid_h_px = sum(rows_px) + (len(rows_px) - 1) * ROW_GAP_PX
-grid_x0 = (CANVAS_W - grid_w_px) // 2
-grid_y0 = (CANVAS_H - grid_h_px) // 2
-
-# Stroke widths and spacings in pixels
-CUT_W    = mm_to_px(CUT_THICK_MM)
-TICK_W   = mm_to_px(TICK_THICK_MM)
-TICK_LEN = mm_to_px(TICK_LEN_MM)
-SAFE_INSET = mm_to_px(SAFE_INSET_MM)
-DASH_LEN = mm_to_px(DASH_LEN_MM)
-GAP_LEN  = mm_to_px(GAP_LEN_MM)
+def render(L, W, H, img_path, json_path, fmt="png", fast_io=False):
+    # Faces defined as (name, width_m, height_m).
+    # Layout (rows x cols = 3 x 2):
+    # Row 0: [SIDE A][END A]    -> END A butts to SIDE A right edge
+    # Row 1: [TOP][BOTTOM]      -> both centered in their cells
+    # Row 2: [SIDE B][END B]    -> END B butts to SIDE B right edge
+    faces = [
+        ("SIDE A",   L, H),
+        ("END A",    W, H),
+        ("TOP",      L, W),
+        ("BOTTOM",   L, W),
+        ("SIDE B",   L, H),
+        ("END B",    W, H),
+    ]
+
+    grid = [
+        [faces[0], faces[1]],
+        [faces[2], faces[3]],
+        [faces[4], faces[5]],
+    ]
+
+    # Column and row maxima (meters)
+    cols_m = [0.0, 0.0]
+    rows_m = [0.0, 0.0, 0.0]
+    for r in range(3):
+        for c in range(2):
+            _, wm, hm = grid[r][c]
+            cols_m[c] = max(cols_m[c], wm)
+            rows_m[r] = max(rows_m[r], hm)
+
+    sum_cols_m = sum(cols_m)
+    sum_rows_m = sum(rows_m)
+
+    # Available pixel area for faces (excluding margins and gaps)
+    avail_w_px = CANVAS_W - 2 * MARGIN_PX - (2 - 1) * COL_GAP_PX
+    avail_h_px = CANVAS_H - 2 * MARGIN_PX - (3 - 1) * ROW_GAP_PX
+
+    # Scale (pixels per meter), uniform to preserve proportions
+    s_w = avail_w_px / sum_cols_m
+    s_h = avail_h_px / sum_rows_m
+    s = min(s_w, s_h)
+
+    # Precompute pixel column/row sizes for grid cells
+    cols_px = [int(round(wm * s)) for wm in cols_m]
+    rows_px = [int(round(hm * s)) for hm in rows_m]
+
+    # Face pixel sizes, one vector op for all six faces (indexed as faces[2*r + c])
+    fw_px = np.rint(np.array([f[1] for f in faces]) * s).astype(np.int32)
+    fh_px = np.rint(np.array([f[2] for f in faces]) * s).astype(np.int32)
+
+    # Grid origin in canvas
+    grid_w_px = sum(cols_px) + COL_GAP_PX
+    grid_h_px = sum(rows_px) + (len(rows_px) - 1) * ROW_GAP_PX
+    grid_x0 = (CANVAS_W - grid_w_px) // 2
+    grid_y0 = (CANVAS_H - grid_h_px) // 2
+
+    # Stroke widths and spacings in pixels. mm -> px conversion only happens
+    # here, once s is known; everything downstream sees plain int constants.
+    _px = lambda mm: max(1, int(round((mm / 1000.0) * s)))
+    CUT_W    = _px(CUT_THICK_MM)
+    SAFE_W   = max(1, CUT_W // 2)
+    TICK_W   = _px(TICK_THICK_MM)
+    TICK_LEN = _px(TICK_LEN_MM)
+    SAFE_INSET = _px(SAFE_INSET_MM)
+    DASH_LEN = _px(DASH_LEN_MM)
+    GAP_LEN  = _px(GAP_LEN_MM)
+
+    # One contiguous uint8 index buffer for the whole render; PIL is only
+    # involved for glyph rasterization and the final save.
+    arr = np.zeros((CANVAS_H, CANVAS_W), dtype=np.uint8)
+    font = ImageFont.load_default()
+
+    metadata = {
+        "canvas_px": [CANVAS_W, CANVAS_H],
+        "scale_px_per_meter": s,
+        "faces": [],
+    }
+
+    # Which faces butt against their row neighbour (END right of SIDE)
+    butt = np.zeros(len(faces), dtype=np.bool_)
+    for r in range(3):
+        butt[2 * r + 1] = (grid[r][1][0].startswith("END")
+                           and grid[r][0][0].startswith("SIDE"))
+
+    cut_rects, safe_rects = compute_rects(
+        fw_px, fh_px, butt,
+        np.array(cols_px, dtype=np.int32), np.array(rows_px, dtype=np.int32),
+        grid_x0, grid_y0, COL_GAP_PX, ROW_GAP_PX, SAFE_INSET)
+
+    # Local bindings for the face loop: dozens of calls, so skip the
+    # repeated global lookups.
+    fg, accent = FG, ACCENT
+    stamp_cache = {}
+
+    for i, (name, wm, hm) in enumerate(faces):
+        fx0, fy0, fx1, fy1 = (int(v) for v in cut_rects[i])
+
+        # A face smaller than twice the safe inset has no safe area; skip
+        # its dashes and label rather than drawing degenerate geometry.
+        safe = tuple(int(v) for v in safe_rects[i])
+        safe_ok = safe[2] > safe[0] and safe[3] > safe[1]
+
+        # Cut outline, dashed safe rect and corner ticks in one blit
+        stamp = face_stamp(stamp_cache, fx1 - fx0, fy1 - fy0, CUT_W, SAFE_W,
+                           TICK_LEN, TICK_W, SAFE_INSET, DASH_LEN, GAP_LEN)
+        region = arr[fy0:fy0 + stamp.shape[0], fx0:fx0 + stamp.shape[1]]
+        np.copyto(region, stamp, where=stamp != BG)
+
+        # Label
+        if safe_ok:
+            label = f"{name} ({wm:g}m x {hm:g}m)"
+            text_cached(arr, (fx0 + SAFE_INSET, fy0 + SAFE_INSET - 14), label, accent, font)
+
+        # Seam ID where END meets SIDE (rows 0 and 2)
+        if butt[i]:
+            sy0, sy1 = int(cut_rects[i - 1][1]), int(cut_rects[i - 1][3])
+            seam_mid_y = (max(fy0, sy0) + min(fy1, sy1)) // 2
+            text_cached(arr, (fx0 + 6, seam_mid_y - 6), "SEAM S->E", fg, font)
+
+        # Metadata capture
+        face_meta = {
+            "name": name,
+            "meters": {"w": wm, "h": hm},
+            "cut_rect":  rect_to_uv((fx0, fy0, fx1, fy1), CANVAS_W, CANVAS_H),
+            "safe_rect": rect_to_uv(safe, CANVAS_W, CANVAS_H) if safe_ok else None,
+        }
+        if i % 2 == 1:
+            face_meta["butted_to_side_right_edge"] = bool(butt[i])
+        metadata["faces"].append(face_meta)
+
+    # Optional title
+    text_cached(arr, (grid_x0, grid_y0 - 24), "UV Map Guides (cuts, safe area, ticks, seam IDs)", FG, font)
+    text_cached(arr, (grid_x0, grid_y0 - 10), f"L={L}m, W={W}m, H={H}m | SAFE_INSET={SAFE_INSET_MM}mm", ACCENT, font)
+
+    # Save outputs
+    # compress_level=1 is 2-3x faster than Pillow's default (6) and the guide
+    # image is mostly transparent, so the size cost is negligible. Building
+    # Pillow against zlib-ng roughly doubles deflate speed again.
+    if fmt == "webp":
+        Image.fromarray(PALETTE_RGBA[arr], "RGBA").save(img_path, "WEBP", lossless=True)
+    elif fast_io and pyvips is not None:
+        # filter=NONE skips PNG row-filter selection, which dominates encode
+        # time for a mostly-transparent canvas like this one. Encoded as
+        # plain RGBA: libvips' palette=True quantizer at low effort mangles
+        # this canvas (background turns opaque, strokes vanish), so it is
+        # deliberately not used here.
+        pyvips.Image.new_from_array(PALETTE_RGBA[arr]).pngsave(
+            img_path, compression=1, filter=pyvips.enums.ForeignPngFilter.NONE)
+    else:
+        if fast_io:
+            print("pyvips not installed; saving PNG with Pillow")
+        # No quantize pass needed here: the buffer is already a 3-color
+        # paletted image, which is exactly what libimagequant would produce.
+        img = Image.fromarray(arr, "P")
+        img.putpalette(PALETTE)
+        img.info["transparency"] = BG
+        img.save(img_path, "PNG", compress_level=1, optimize=False)
+        # The feature name only exists on Pillow >= 11.3; check_feature
+        # raises ValueError for names it doesn't know.
+        if "zlib_ng" in features.features and features.check_feature("zlib_ng"):
+            print("PNG deflate backend: zlib-ng")
+    if orjson is not None:
+        Path(json_path).write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    else:
+        with open(json_path, "w") as f:
+            json.dump(metadata, f, indent=2)
+
+    print("Wrote:", img_path)
+    print("Wrote:", json_path)
 
 # ----------------------
-# Render
+# Command line
 # ----------------------
-img = Image.new("RGBA", (CANVAS_W, CANVAS_H), BG)
-draw = ImageDraw.Draw(img)
-font = ImageFont.load_default()
-
-metadata = {
-    "canvas_px": [CANVAS_W, CANVAS_H],
-    "scale_px_per_meter": s,
-    "faces": [],
-}
-
-y = grid_y0
-for r in range(3):
-    x_left = grid_x0
-    cell_w_left  = cols_px[0]
-    cell_w_right = cols_px[1]
-    cell_h       = rows_px[r]
-
-    # LEFT column face (SIDE or TOP)
-    name0, wm0, hm0 = grid[r][0]
-    fw0, fh0 = int(round(wm0 * s)), int(round(hm0 * s))
-    fx0_0 = x_left + (cell_w_left - fw0) // 2
-    fy0_0 = y + (cell_h - fh0) // 2
-    fx1_0, fy1_0 = fx0_0 + fw0, fy0_0 + fh0
-
-    # RIGHT column face (END or BOTTOM)
-    x_right = x_left + cell_w_left + COL_GAP_PX
-    name1, wm1, hm1 = grid[r][1]
-    fw1, fh1 = int(round(wm1 * s)), int(round(hm1 * s))
-    if name1.startswith("END") and name0.startswith("SIDE"):
-        # Butt END's left edge to SIDE's right edge
-        fx0_1 = fx1_0
+
+def parse_box(spec):
+    try:
+        l, w, h = (float(v) for v in spec.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected LxWxH, got {spec!r}")
+    if l <= 0 or w <= 0 or h <= 0:
+        raise argparse.ArgumentTypeError(f"dimensions must be positive, got {spec!r}")
+    return l, w, h
+
+def _render_job(job):
+    render(*job)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate UV map guides for a rectangular box.")
+    parser.add_argument("--box", action="append", type=parse_box, metavar="LxWxH",
+                        help="box dimensions in meters, e.g. 12.2x3.048x3.1; "
+                             "repeat the flag to render a batch of boxes in parallel")
+    parser.add_argument("--format", choices=("png", "webp"), default="png",
+                        help="output image format; lossless WebP is usually smaller "
+                             "and faster to encode than PNG for this sparse canvas")
+    parser.add_argument("--fast-io", action="store_true",
+                        help="encode the PNG through pyvips when installed; "
+                             "noticeably faster than Pillow for large canvases")
+    args = parser.parse_args()
+
+    if args.box:
+        jobs = []
+        for l, w, h in args.box:
+            stem = f"uv-layout-{l:g}x{w:g}x{h:g}"
+            jobs.append((l, w, h, f"{stem}.{args.format}", f"{stem}.json",
+                         args.format, args.fast_io))
     else:
-        # Center in right cell
-        fx0_1 = x_right + (cell_w_right - fw1) // 2
-    fy0_1 = y + (cell_h - fh1) // 2
-    fx1_1, fy1_1 = fx0_1 + fw1, fy0_1 + fh1
-
-    # Solid cut outlines
-    draw.rectangle([fx0_0, fy0_0, fx1_0, fy1_0], outline=FG, width=CUT_W)
-    draw.rectangle([fx0_1, fy0_1, fx1_1, fy1_1], outline=FG, width=CUT_W)
-
-    # Dashed safe areas (inset)
-    safe0 = (fx0_0 + SAFE_INSET, fy0_0 + SAFE_INSET, fx1_0 - SAFE_INSET, fy1_0 - SAFE_INSET)
-    safe1 = (fx0_1 + SAFE_INSET, fy0_1 + SAFE_INSET, fx1_1 - SAFE_INSET, fy1_1 - SAFE_INSET)
-    dashed_rect(draw, safe0, DASH_LEN, GAP_LEN, ACCENT, max(1, CUT_W // 2))
-    dashed_rect(draw, safe1, DASH_LEN, GAP_LEN, ACCENT, max(1, CUT_W // 2))
-
-    # Corner ticks
-    corner_ticks(draw, (fx0_0, fy0_0, fx1_0, fy1_0), TICK_LEN, TICK_W, FG)
-    corner_ticks(draw, (fx0_1, fy0_1, fx1_1, fy1_1), TICK_LEN, TICK_W, FG)
-
-    # Labels
-    label0 = f"{name0} ({wm0:g}m x {hm0:g}m)"
-    label1 = f"{name1} ({wm1:g}m x {hm1:g}m)"
-    draw.text((fx0_0 + SAFE_INSET, fy0_0 + SAFE_INSET - 14), label0, fill=ACCENT, font=font)
-    draw.text((fx0_1 + SAFE_INSET, fy0_1 + SAFE_INSET - 14), label1, fill=ACCENT, font=font)
-
-    # Seam ID where END meets SIDE (rows 0 and 2)
-    if name1.startswith("END") and name0.startswith("SIDE"):
-        seam_mid_y = (max(fy0_0, fy0_1) + min(fy1_0, fy1_1)) // 2
-        seam_x = fx1_0
-        draw.text((seam_x + 6, seam_mid_y - 6), "SEAM S->E", fill=FG, font=font)
-
-    # Metadata capture
-    metadata["faces"].append({
-        "name": name0,
-        "meters": {"w": wm0, "h": hm0},
-        "cut_rect":  rect_to_uv((fx0_0, fy0_0, fx1_0, fy1_0), CANVAS_W, CANVAS_H),
-        "safe_rect": rect_to_uv(safe0, CANVAS_W, CANVAS_H),
-    })
-    metadata["faces"].append({
-        "name": name1,
-        "meters": {"w": wm1, "h": hm1},
-        "cut_rect":  rect_to_uv((fx0_1, fy0_1, fx1_1, fy1_1), CANVAS_W, CANVAS_H),
-        "safe_rect": rect_to_uv(safe1, CANVAS_W, CANVAS_H),
-        "butted_to_side_right_edge": bool(name1.startswith("END") and name0.startswith("SIDE")),
-    })
-
-    y += cell_h + ROW_GAP_PX
-
-# Optional title
-draw.text((grid_x0, grid_y0 - 24), "UV Map Guides (cuts, safe area, ticks, seam IDs)", fill=FG, font=font)
-draw.text((grid_x0, grid_y0 - 10), f"L={L}m, W={W}m, H={H}m | SAFE_INSET={SAFE_INSET_MM}mm", fill=ACCENT, font=font)
-
-# Save outputs
-img.save(PNG_PATH, "PNG")
-with open(JSON_PATH, "w") as f:
-    json.dump(metadata, f, indent=2)
-
-print("Wrote:", PNG_PATH)
-print("Wrote:", JSON_PATH)
+        img_path = PNG_PATH if args.format == "png" else WEBP_PATH
+        jobs = [(L, W, H, img_path, JSON_PATH, args.format, args.fast_io)]
+
+    if len(jobs) == 1:
+        render(*jobs[0])
+    else:
+        # Each box is independent and the PNG deflate is CPU-bound, so a
+        # batch scales near-linearly with cores.
+        with ProcessPoolExecutor() as pool:
+            list(pool.map(_render_job, jobs))
+
+if __name__ == "__main__":
+    main()